@@ -1,118 +1,642 @@
-﻿import random
+﻿import argparse
+import gc
+import json
+import mmap
+import os
+import platform
+import random
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
 from collections import deque
-from typing import Optional, List
+from contextlib import contextmanager
+from functools import partial
+from itertools import groupby, islice, repeat
+from typing import Optional, List, Dict, Iterable, Iterator, Sequence, Tuple, Callable, TextIO
+
+
+@contextmanager
+def _gc_paused():
+    """Отключает циклический сборщик мусора на время массового создания узлов"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 class Node:
-    """Узел бинарного дерева"""
+    """Узел бинарного дерева
+    
+    Кроме ссылок на потомков узел хранит число копий значения count
+    (больше 1 только в режиме multiset) и метрики своего поддерева:
+    высоту, число элементов с учетом копий и число узлов с обоими потомками.
+    Метрики поддерживает BinaryTree; у узлов, связанных вручную, они
+    пересчитываются после присваивания BinaryTree.root.
+    
+    Атрибуты хранятся в __slots__ без __dict__: 88 байт на узел
+    в CPython 3.11 (не считая объекта value) против 136 байт у обычного
+    объекта. Замер - node_memory_usage().
+    """
+    __slots__ = ('value', 'count', 'left', 'right', 'height', 'size', 'full')
+    
     def __init__(self, value: int):
         self.value = value
+        self.count = 1
         self.left: Optional['Node'] = None
         self.right: Optional['Node'] = None
+        self.height = 1
+        self.size = 1
+        self.full = 0
+    
+    def copy(self) -> 'Node':
+        """Копия узла с теми же потомками и метриками"""
+        node = Node(self.value)
+        node.count = self.count
+        node.left = self.left
+        node.right = self.right
+        node.height = self.height
+        node.size = self.size
+        node.full = self.full
+        return node
     
     def __str__(self) -> str:
         return str(self.value)
 
 
 class BinaryTree:
-    """Бинарное дерево поиска"""
-    def __init__(self):
-        self.root: Optional[Node] = None
+    """Бинарное дерево поиска
     
-    def insert(self, value: int) -> None:
-        """Вставка элемента в дерево"""
-        if self.root is None:
-            self.root = Node(value)
-        else:
-            self._insert_recursive(self.root, value)
+    При balanced=True дерево балансируется как AVL-дерево: после каждой
+    вставки и удаления высота остается O(log n).
+    
+    Все операции выполняются итеративно с явным стеком, поэтому работают
+    на дереве любой глубины без RecursionError.
+    
+    Размер, высота и число полных узлов поддерживаются в узлах при каждой
+    вставке и удалении, поэтому len(), max_depth() и count_full_nodes()
+    отвечают за O(1). Дерево можно собрать и вручную, присвоив root и
+    связав Node через left/right (как в task6): после присваивания root
+    метрики всех узлов пересчитываются один раз при первом обращении к
+    ним. Если связи узлов меняются вручную уже после этого, нужен
+    refresh_metrics().
+    
+    При persistent=True узлы никогда не меняются на месте: вставка и
+    удаление копируют путь от корня, а остальные поддеревья разделяются
+    со старой версией. snapshot() за O(1) отдает неизменяемую версию,
+    которую потоки-читатели обходят без блокировок, пока единственный
+    писатель меняет дерево.
+    
+    При multiset=True равные значения не образуют новых узлов, а
+    увеличивают счетчик count существующего узла, так что высота и число
+    узлов зависят только от числа различных ключей.
+    """
+    def __init__(self, balanced: bool = False, persistent: bool = False,
+                 multiset: bool = False):
+        self._root: Optional[Node] = None
+        # Корень назначен снаружи: метрики узлов могут быть не посчитаны
+        self._dirty = False
+        self.balanced = balanced
+        self.persistent = persistent
+        self.multiset = multiset
+        self._frozen = False
+    
+    @property
+    def root(self) -> Optional[Node]:
+        return self._root
+    
+    @root.setter
+    def root(self, node: Optional[Node]) -> None:
+        # Узлы, связанные вручную, пересчитываются при первом обращении к метрикам
+        self._root = node
+        self._dirty = True
+    
+    def _measured(self) -> Optional[Node]:
+        """Корень с актуальными метриками узлов"""
+        if self._dirty:
+            self.refresh_metrics()
+        return self._root
+    
+    @classmethod
+    def from_sorted(cls, values: Sequence[int], **options) -> 'BinaryTree':
+        """Строит идеально сбалансированное дерево из отсортированной последовательности за O(n)
+        
+        Порядок values не проверяется. Остальные аргументы передаются конструктору.
+        """
+        if options.get('multiset'):
+            runs = ((value, sum(1 for _ in group)) for value, group in groupby(values))
+            return cls._from_runs(runs, **options)
+        tree = cls(**options)
+        with _gc_paused():
+            tree._root = cls._build_balanced(values)
+        return tree
+    
+    @classmethod
+    def from_iterable(cls, values: Iterable[int], **options) -> 'BinaryTree':
+        """Строит сбалансированное дерево из произвольных значений (одна сортировка)"""
+        return cls.from_sorted(sorted(values), **options)
+    
+    @classmethod
+    def _from_runs(cls, runs: Iterable[Tuple[int, int]], **options) -> 'BinaryTree':
+        """Сбалансированное дерево из возрастающих пар (значение, число копий)"""
+        tree = cls(**options)
+        values = []
+        counts = []
+        for value, count in runs:
+            values.append(value)
+            counts.append(count)
+        if not tree.multiset:
+            values = [value for value, count in zip(values, counts) for _ in range(count)]
+            counts = None
+        with _gc_paused():
+            tree._root = cls._build_balanced(values, counts)
+        return tree
+    
+    @classmethod
+    def merge(cls, a: 'BinaryTree', b: 'BinaryTree', **options) -> 'BinaryTree':
+        """Все значения обоих деревьев (копии складываются), O(n + m)
+        
+        Результат - новое сбалансированное дерево; режимы по умолчанию
+        берутся у a, остальные аргументы передаются конструктору.
+        """
+        return a._combine(b, lambda left, right: left + right, options, cls)
+    
+    def union(self, other: 'BinaryTree', **options) -> 'BinaryTree':
+        """Объединение: каждое значение в наибольшем из двух чисел копий, O(n + m)"""
+        return self._combine(other, max, options)
+    
+    def intersection(self, other: 'BinaryTree', **options) -> 'BinaryTree':
+        """Пересечение: каждое значение в наименьшем из двух чисел копий, O(n + m)"""
+        return self._combine(other, min, options)
     
-    def _insert_recursive(self, node: Node, value: int) -> None:
-        """Рекурсивная вставка элемента"""
-        if value < node.value:
-            if node.left is None:
-                node.left = Node(value)
+    def _combine(self, other: 'BinaryTree', combine: Callable[[int, int], int],
+                 options: Dict, cls=None) -> 'BinaryTree':
+        """Слияние потоков (значение, копии) двух деревьев с пересборкой за O(n + m)"""
+        runs = self._merge_runs(self._iter_runs(), other._iter_runs(), combine)
+        return (cls or type(self))._from_runs(runs, **dict(self._options(), **options))
+    
+    @staticmethod
+    def _merge_runs(left: Iterator[Tuple[int, int]], right: Iterator[Tuple[int, int]],
+                    combine: Callable[[int, int], int]) -> Iterator[Tuple[int, int]]:
+        a = next(left, None)
+        b = next(right, None)
+        while a is not None or b is not None:
+            if b is None or (a is not None and a[0] < b[0]):
+                value, count = a[0], combine(a[1], 0)
+                a = next(left, None)
+            elif a is None or b[0] < a[0]:
+                value, count = b[0], combine(0, b[1])
+                b = next(right, None)
+            else:
+                value, count = a[0], combine(a[1], b[1])
+                a = next(left, None)
+                b = next(right, None)
+            if count:
+                yield value, count
+    
+    def _iter_runs(self) -> Iterator[Tuple[int, int]]:
+        """Возрастающие пары (значение, число копий); равные узлы склеиваются"""
+        current = None
+        count = 0
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            if count and node.value == current:
+                count += node.count
             else:
-                self._insert_recursive(node.left, value)
+                if count:
+                    yield current, count
+                current, count = node.value, node.count
+            node = node.right
+        if count:
+            yield current, count
+    
+    def split(self, key: int) -> Tuple['BinaryTree', 'BinaryTree']:
+        """Делит дерево на значения < key и >= key за O(высоты)
+        
+        Узлы переходят в результат, само дерево становится пустым; в
+        persistent-режиме исходная версия не меняется.
+        """
+        self._check_writable()
+        path = []
+        node = self._measured()
+        while node is not None:
+            path.append(node)
+            node = node.right if node.value < key else node.left
+        
+        left = right = None
+        for node in reversed(path):
+            node = self._own(node)
+            if node.value < key:
+                left = self._join(node.left, node, left)
+            else:
+                right = self._join(right, node, node.right)
+        
+        if not self.persistent:
+            self._root = None
+        left_tree, right_tree = self._empty_like(), self._empty_like()
+        left_tree._root, right_tree._root = left, right
+        return left_tree, right_tree
+    
+    def _join(self, left: Optional[Node], node: Node, right: Optional[Node]) -> Node:
+        """Подвешивает left и right к node (все left <= node <= right)
+        
+        В сбалансированном режиме более низкое поддерево спускается по краю
+        более высокого (AVL-join), стоимость O(разности высот).
+        """
+        left_height, right_height = self._height(left), self._height(right)
+        if not self.balanced or abs(left_height - right_height) <= 1:
+            node.left, node.right = left, right
+            self._update(node)
+            return node
+        
+        go_right = left_height > right_height
+        top, low_height = (left, right_height) if go_right else (right, left_height)
+        spine = []
+        current = top
+        while self._height(current) > low_height + 1:
+            current = self._own(current)
+            if spine:
+                if go_right:
+                    spine[-1].right = current
+                else:
+                    spine[-1].left = current
+            spine.append(current)
+            current = current.right if go_right else current.left
+        
+        if go_right:
+            node.left, node.right = current, right
+            spine[-1].right = node
         else:
-            if node.right is None:
-                node.right = Node(value)
+            node.left, node.right = left, current
+            spine[-1].left = node
+        self._update(node)
+        
+        for i in range(len(spine) - 1, -1, -1):
+            subtree = self._rebalance(spine[i])
+            if i == 0:
+                return subtree
+            if go_right:
+                spine[i - 1].right = subtree
             else:
-                self._insert_recursive(node.right, value)
+                spine[i - 1].left = subtree
+    
+    def _options(self) -> Dict[str, bool]:
+        return {'balanced': self.balanced, 'persistent': self.persistent,
+                'multiset': self.multiset}
+    
+    def _empty_like(self) -> 'BinaryTree':
+        return type(self)(**self._options())
+    
+    @staticmethod
+    def _build_balanced(values: Sequence[int],
+                        counts: Optional[Sequence[int]] = None) -> Optional[Node]:
+        """Связывает узлы по срединным элементам отрезков values без рекурсии"""
+        nodes = [Node(value) for value in values]
+        if not nodes:
+            return None
+        if counts is not None:
+            for node, count in zip(nodes, counts):
+                node.count = count
+        
+        linked = []
+        stack = [(0, len(nodes))]
+        while stack:
+            lo, hi = stack.pop()
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            linked.append(node)
+            if lo < mid:
+                node.left = nodes[(lo + mid) // 2]
+                stack.append((lo, mid))
+            if mid + 1 < hi:
+                node.right = nodes[(mid + 1 + hi) // 2]
+                stack.append((mid + 1, hi))
+        
+        # linked - прямой порядок, значит в обратном потомки идут раньше предков
+        for node in reversed(linked):
+            BinaryTree._update(node)
+        return nodes[len(nodes) // 2]
+    
+    def snapshot(self) -> 'BinaryTree':
+        """Неизменяемая версия дерева за O(1), только при persistent=True"""
+        if not self.persistent:
+            raise ValueError("снимки доступны только для дерева с persistent=True")
+        snap = self._empty_like()
+        snap._root = self._measured()
+        snap._frozen = True
+        return snap
+    
+    def insert(self, value: int) -> None:
+        """Вставка элемента в дерево"""
+        self._check_writable()
+        multiset = self.multiset
+        path = []
+        node = self._measured()
+        while node is not None:
+            path.append(node)
+            if multiset and value == node.value:
+                self._add_copies(path, 1)
+                return
+            node = node.left if value < node.value else node.right
+        
+        new_node = Node(value)
+        if not path:
+            self._root = new_node
+            return
+        
+        old_root = self._root
+        path = self._writable_path(path)
+        parent = path[-1]
+        # Родитель с одним потомком становится полным узлом
+        full_delta = 1 if (parent.left is None) != (parent.right is None) else 0
+        for ancestor in path:
+            ancestor.size += 1
+        if full_delta:
+            for ancestor in path:
+                ancestor.full += 1
+        
+        if value < parent.value:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        
+        self._fix_path(path)
+        self._publish(path, old_root)
     
     def delete(self, value: int) -> None:
-        """Удаление элемента из дерева"""
-        self.root = self._delete_recursive(self.root, value)
+        """Удаление элемента из дерева (одного вхождения)"""
+        self._delete(value, every=False)
     
-    def _delete_recursive(self, node: Optional[Node], value: int) -> Optional[Node]:
-        """Рекурсивное удаление элемента"""
+    def delete_all(self, value: int) -> int:
+        """Удаляет все вхождения value, возвращает их число"""
+        if self.multiset:
+            return self._delete(value, every=True)
+        removed = 0
+        while self._delete(value, every=False):
+            removed += 1
+        return removed
+    
+    def _add_copies(self, path: List[Node], delta: int) -> None:
+        """Меняет счетчик копий последнего узла пути без изменения формы дерева"""
+        old_root = self._root
+        path = self._writable_path(path)
+        path[-1].count += delta
+        for ancestor in path:
+            ancestor.size += delta
+        self._publish(path, old_root)
+    
+    def _delete(self, value: int, every: bool) -> int:
+        """Удаляет одно (или при every все) вхождения value, возвращает число удаленных"""
+        self._check_writable()
+        path = []
+        node = self._measured()
+        while node is not None and node.value != value:
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        
         if node is None:
-            return None
+            return 0
+        
+        if node.count > 1 and not every:
+            path.append(node)
+            self._add_copies(path, -1)
+            return 1
         
-        if value < node.value:
-            node.left = self._delete_recursive(node.left, value)
-        elif value > node.value:
-            node.right = self._delete_recursive(node.right, value)
+        removed = node.count
+        target_index = None
+        if node.left is not None and node.right is not None:
+            # Значение заменяется минимальным из правого поддерева,
+            # а удаляется сам минимальный узел (у него нет левого потомка)
+            target_index = len(path)
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node = successor
+        
+        old_root = self._root
+        path = self._writable_path(path)
+        if target_index is not None:
+            target = path[target_index]
+            target.value = node.value
+            target.count = node.count
+        
+        child = node.left if node.left is not None else node.right
+        parent = path[-1] if path else None
+        # Полный родитель, у которого удаляется лист, перестает быть полным
+        full_delta = 1 if (parent is not None and child is None
+                           and parent.left is not None and parent.right is not None) else 0
+        self._replace_child(parent, node, child)
+        if target_index is None:
+            for ancestor in path:
+                ancestor.size -= removed
         else:
-            if node.left is None:
-                return node.right
-            elif node.right is None:
-                return node.left
+            # Ниже target теряются только копии поднятого преемника
+            for ancestor in path[:target_index + 1]:
+                ancestor.size -= removed
+            for ancestor in path[target_index + 1:]:
+                ancestor.size -= node.count
+        if full_delta:
+            for ancestor in path:
+                ancestor.full -= 1
+        
+        self._fix_path(path)
+        self._publish(path, old_root)
+        return removed
+    
+    def _check_writable(self) -> None:
+        if self._frozen:
+            raise TypeError("снимок дерева нельзя изменять")
+    
+    def _own(self, node: Node) -> Node:
+        """Узел, который можно менять: в persistent-режиме - его копия"""
+        return node.copy() if self.persistent else node
+    
+    def _writable_path(self, path: List[Node]) -> List[Node]:
+        """Путь от корня, узлы которого можно менять на месте
+        
+        В persistent-режиме это связанные между собой копии; в корень они
+        попадают только в _publish(), когда изменение полностью готово.
+        """
+        if not self.persistent:
+            return path
+        copies = [node.copy() for node in path]
+        for i in range(1, len(copies)):
+            parent = copies[i - 1]
+            if parent.left is path[i]:
+                parent.left = copies[i]
             else:
-                min_node = self._find_min(node.right)
-                node.value = min_node.value
-                node.right = self._delete_recursive(node.right, min_node.value)
+                parent.right = copies[i]
+        return copies
+    
+    def _publish(self, path: List[Node], old_root: Optional[Node]) -> None:
+        """Делает новую версию видимой одним присваиванием корня"""
+        # Если корень уже заменен поворотом в _fix_path, он окончательный
+        if path and self._root is old_root:
+            self._root = path[0]
+    
+    def _replace_child(self, parent: Optional[Node], old: Node, new: Optional[Node]) -> None:
+        """Подвешивает new на место потомка old у parent (или в корень)"""
+        if parent is None:
+            self._root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+    
+    def _fix_path(self, path: List[Node]) -> None:
+        """Пересчет высот (и AVL-балансировка) узлов пути снизу вверх
         
-        return node
+        Размеры и числа полных узлов на пути уже исправлены вызывающим кодом,
+        поэтому подъем останавливается, как только высота не изменилась.
+        Поворот может изменить число полных узлов поддерева - эта разница
+        переносится на оставшихся предков.
+        """
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            old_full = node.full
+            if self.balanced:
+                new_root = self._rebalance(node)
+            else:
+                self._update(node)
+                new_root = node
+            if new_root is not node:
+                self._replace_child(path[i - 1] if i else None, node, new_root)
+            elif node.height == old_height:
+                full_delta = node.full - old_full
+                if full_delta:
+                    for ancestor in path[:i]:
+                        ancestor.full += full_delta
+                break
     
-    def _find_min(self, node: Node) -> Node:
-        """Находит минимальный узел в поддереве"""
-        while node.left is not None:
-            node = node.left
+    @staticmethod
+    def _height(node: Optional[Node]) -> int:
+        return node.height if node else 0
+    
+    @staticmethod
+    def _size(node: Optional[Node]) -> int:
+        return node.size if node else 0
+    
+    @staticmethod
+    def _update(node: Node) -> None:
+        """Пересчитывает метрики узла по его потомкам"""
+        left, right = node.left, node.right
+        if left is not None and right is not None:
+            node.height = (left.height if left.height > right.height else right.height) + 1
+            node.size = left.size + right.size + node.count
+            node.full = left.full + right.full + 1
+        elif left is not None or right is not None:
+            child = left or right
+            node.height = child.height + 1
+            node.size = child.size + node.count
+            node.full = child.full
+        else:
+            node.height = 1
+            node.size = node.count
+            node.full = 0
+    
+    def _rotate_left(self, node: Node) -> Node:
+        node = self._own(node)
+        pivot = self._own(node.right)
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+    
+    def _rotate_right(self, node: Node) -> Node:
+        node = self._own(node)
+        pivot = self._own(node.left)
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+    
+    def _rebalance(self, node: Node) -> Node:
+        """Восстанавливает AVL-баланс узла, возвращает новый корень поддерева"""
+        self._update(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
         return node
     
     def inorder(self) -> List[int]:
         """Центрированный обход (левый, корень, правый)"""
         result = []
-        self._inorder_recursive(self.root, result)
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            if node.count == 1:
+                result.append(node.value)
+            else:
+                result.extend(repeat(node.value, node.count))
+            node = node.right
         return result
     
-    def _inorder_recursive(self, node: Optional[Node], result: List[int]) -> None:
-        if node:
-            self._inorder_recursive(node.left, result)
-            result.append(node.value)
-            self._inorder_recursive(node.right, result)
-    
     def preorder(self) -> List[int]:
         """Прямой обход (корень, левый, правый)"""
         result = []
-        self._preorder_recursive(self.root, result)
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            if node.count == 1:
+                result.append(node.value)
+            else:
+                result.extend(repeat(node.value, node.count))
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
         return result
     
-    def _preorder_recursive(self, node: Optional[Node], result: List[int]) -> None:
-        if node:
-            result.append(node.value)
-            self._preorder_recursive(node.left, result)
-            self._preorder_recursive(node.right, result)
-    
     def postorder(self) -> List[int]:
         """Обратный обход (левый, правый, корень)"""
+        # Обход (корень, правый, левый), записанный задом наперед
         result = []
-        self._postorder_recursive(self.root, result)
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            if node.count == 1:
+                result.append(node.value)
+            else:
+                result.extend(repeat(node.value, node.count))
+            if node.left:
+                stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+        result.reverse()
         return result
     
-    def _postorder_recursive(self, node: Optional[Node], result: List[int]) -> None:
-        if node:
-            self._postorder_recursive(node.left, result)
-            self._postorder_recursive(node.right, result)
-            result.append(node.value)
-    
     def level_order(self) -> List[List[int]]:
         """Обход по уровням (ширина)"""
-        if not self.root:
+        if not self._root:
             return []
         
         result = []
-        queue = deque([self.root])
+        queue = deque([self._root])
         
         while queue:
             level_size = len(queue)
@@ -120,7 +644,10 @@ class BinaryTree:
             
             for _ in range(level_size):
                 node = queue.popleft()
-                current_level.append(node.value)
+                if node.count == 1:
+                    current_level.append(node.value)
+                else:
+                    current_level.extend(repeat(node.value, node.count))
                 
                 if node.left:
                     queue.append(node.left)
@@ -131,94 +658,654 @@ class BinaryTree:
         
         return result
     
-    def max_depth(self) -> int:
-        """Возвращает максимальную глубину дерева"""
-        return self._max_depth_recursive(self.root)
+    def __iter__(self) -> Iterator[int]:
+        """Значения дерева в порядке возрастания (лениво)"""
+        return self.iter_inorder()
     
-    def _max_depth_recursive(self, node: Optional[Node]) -> int:
-        if node is None:
-            return 0
-        left_depth = self._max_depth_recursive(node.left)
-        right_depth = self._max_depth_recursive(node.right)
-        return max(left_depth, right_depth) + 1
+    # В ленивых обходах expand=False выдает каждый ключ один раз,
+    # а expand=True - столько раз, сколько у него копий
     
-    def count_full_nodes(self) -> int:
-        """Подсчитывает количество узлов, у которых есть оба потомка"""
-        return self._count_full_nodes_recursive(self.root)
+    def iter_inorder(self, expand: bool = True) -> Iterator[int]:
+        """Ленивый центрированный обход, память O(высоты)"""
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            if expand and node.count > 1:
+                yield from repeat(node.value, node.count)
+            else:
+                yield node.value
+            node = node.right
     
-    def _count_full_nodes_recursive(self, node: Optional[Node]) -> int:
-        if node is None:
-            return 0
+    def iter_preorder(self, expand: bool = True) -> Iterator[int]:
+        """Ленивый прямой обход, память O(высоты)"""
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            if expand and node.count > 1:
+                yield from repeat(node.value, node.count)
+            else:
+                yield node.value
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+    
+    def iter_postorder(self, expand: bool = True) -> Iterator[int]:
+        """Ленивый обратный обход, память O(высоты)"""
+        stack = []
+        node = self._root
+        last_visited = None
+        while stack or node is not None:
+            if node is not None:
+                stack.append(node)
+                node = node.left
+                continue
+            top = stack[-1]
+            if top.right is not None and top.right is not last_visited:
+                node = top.right
+            else:
+                if expand and top.count > 1:
+                    yield from repeat(top.value, top.count)
+                else:
+                    yield top.value
+                last_visited = stack.pop()
+    
+    def iter_level_order(self, expand: bool = True) -> Iterator[int]:
+        """Ленивый обход по уровням, память O(ширины уровня)"""
+        queue = deque([self._root] if self._root else [])
+        while queue:
+            node = queue.popleft()
+            if expand and node.count > 1:
+                yield from repeat(node.value, node.count)
+            else:
+                yield node.value
+            if node.left:
+                queue.append(node.left)
+            if node.right:
+                queue.append(node.right)
+    
+    def get(self, value: int) -> Optional[Node]:
+        """Узел со значением value или None, O(высоты)"""
+        node = self._root
+        while node is not None and node.value != value:
+            node = node.left if value < node.value else node.right
+        return node
+    
+    def contains(self, value: int) -> bool:
+        """Есть ли value в дереве"""
+        return self.get(value) is not None
+    
+    def __contains__(self, value: int) -> bool:
+        return self.get(value) is not None
+    
+    def get_many(self, values: Iterable[int]) -> List[Optional[Node]]:
+        """Пакетный get(): узлы (или None) в порядке запросов
         
+        Запросы сортируются и сливаются с одним центрированным обходом,
+        который пропускает поддеревья без запрошенных значений: каждый
+        узел посещается не более одного раза, итого O(min(n, m * высота) + m log m).
+        """
+        values = list(values)
+        queries = sorted(set(values))
+        found = {}
+        i = 0
+        stack = []
+        node = self._root
+        while i < len(queries):
+            # Спуск к наименьшему непройденному узлу со значением >= queries[i]
+            while node is not None:
+                if node.value < queries[i]:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            while i < len(queries) and queries[i] < node.value:
+                i += 1
+            if i < len(queries) and queries[i] == node.value:
+                found[node.value] = node
+                i += 1
+            node = node.right
+        return [found.get(value) for value in values]
+    
+    def contains_many(self, values: Iterable[int]) -> List[bool]:
+        """Пакетный contains(): флаги в порядке запросов"""
+        return [node is not None for node in self.get_many(values)]
+    
+    def select(self, k: int) -> int:
+        """Возвращает k-й по возрастанию элемент (с нуля) за O(высоты)"""
+        node = self._measured()
+        if not 0 <= k < self._size(node):
+            raise IndexError("индекс вне дерева")
+        while True:
+            left_size = self._size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k < left_size + node.count:
+                return node.value
+            else:
+                k -= left_size + node.count
+                node = node.right
+    
+    def rank(self, value: int) -> int:
+        """Количество элементов, строго меньших value"""
+        return self._count_below(value, inclusive=False)
+    
+    def count_range(self, lo: int, hi: int) -> int:
+        """Количество элементов в отрезке [lo, hi]"""
+        if lo > hi:
+            return 0
+        return self._count_below(hi, inclusive=True) - self._count_below(lo, inclusive=False)
+    
+    def _count_below(self, value: int, inclusive: bool) -> int:
         count = 0
-        if node.left and node.right:
-            count = 1
-        
-        count += self._count_full_nodes_recursive(node.left)
-        count += self._count_full_nodes_recursive(node.right)
-        
+        node = self._measured()
+        while node is not None:
+            if value < node.value or (value == node.value and not inclusive):
+                node = node.left
+            else:
+                count += self._size(node.left) + node.count
+                node = node.right
         return count
     
+    def range(self, lo: int, hi: int) -> Iterator[int]:
+        """Лениво перечисляет элементы отрезка [lo, hi] по возрастанию"""
+        stack = []
+        node = self._root
+        while True:
+            while node is not None:
+                if node.value < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.value > hi:
+                return
+            if node.count > 1:
+                yield from repeat(node.value, node.count)
+            else:
+                yield node.value
+            node = node.right
+    
+    def refresh_metrics(self) -> None:
+        """Пересчитывает метрики всех узлов
+        
+        После присваивания root вызывается сам при первом обращении к
+        метрикам; вручную нужен, только если связи узлов менялись уже
+        после этого.
+        """
+        for node in reversed(self._nodes_preorder()):
+            self._update(node)
+        self._dirty = False
+    
+    def _nodes_preorder(self) -> List[Node]:
+        nodes = []
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+        return nodes
+    
+    def __len__(self) -> int:
+        """Количество элементов дерева, O(1)"""
+        return self._size(self._measured())
+    
+    def max_depth(self) -> int:
+        """Возвращает максимальную глубину дерева, O(1)"""
+        return self._height(self._measured())
+    
+    def count_full_nodes(self) -> int:
+        """Подсчитывает количество узлов, у которых есть оба потомка, O(1)"""
+        root = self._measured()
+        return root.full if root else 0
+    
     def is_symmetric(self) -> bool:
         """Проверяет, является ли дерево симметричным"""
-        if not self.root:
+        if not self._root:
             return True
-        return self._is_mirror(self.root.left, self.root.right)
+        
+        stack = [(self._root.left, self._root.right)]
+        while stack:
+            left, right = stack.pop()
+            if left is None and right is None:
+                continue
+            if (left is None or right is None or left.value != right.value
+                    or left.count != right.count):
+                return False
+            stack.append((left.left, right.right))
+            stack.append((left.right, right.left))
+        return True
     
-    def _is_mirror(self, left: Optional[Node], right: Optional[Node]) -> bool:
-        if left is None and right is None:
-            return True
-        if left is None or right is None:
-            return False
-        return (left.value == right.value and 
-                self._is_mirror(left.left, right.right) and 
-                self._is_mirror(left.right, right.left))
-    
-    def print_tree(self, method: str = 'inorder') -> None:
-        """Вывод дерева разными способами"""
-        print(f"\nДерево (обход {method}):")
-        if method == 'inorder':
-            print(self.inorder())
-        elif method == 'preorder':
-            print(self.preorder())
-        elif method == 'postorder':
-            print(self.postorder())
+    def print_tree(self, method: str = 'inorder', out: Optional[TextIO] = None,
+                   max_nodes: Optional[int] = None, max_depth: Optional[int] = None) -> None:
+        """Вывод дерева разными способами
+        
+        Значения пишутся в out (по умолчанию sys.stdout) по мере обхода,
+        без промежуточных списков. max_nodes ограничивает число выведенных
+        значений, max_depth для method='level' - число верхних уровней;
+        усеченный вывод отмечается многоточием.
+        """
+        out = out or sys.stdout
+        traversals = {'inorder': self.iter_inorder, 'preorder': self.iter_preorder,
+                      'postorder': self.iter_postorder}
+        out.write(f"\nДерево (обход {method}):\n")
+        if method in traversals:
+            self._write_values(out, traversals[method](), max_nodes)
+            out.write("\n")
         elif method == 'level':
-            levels = self.level_order()
-            for i, level in enumerate(levels):
-                print(f"Уровень {i}: {level}")
+            self._write_levels(out, max_nodes, max_depth)
         else:
-            print("Неизвестный метод обхода")
+            out.write("Неизвестный метод обхода\n")
     
-    def visualize(self) -> None:
-        """Визуализация дерева в консоли"""
-        if not self.root:
-            print("Дерево пустое")
-            return
+    @staticmethod
+    def _write_values(out: TextIO, values: Iterator[int], limit: Optional[int]) -> Tuple[int, bool]:
+        """Пишет значения в виде списка порциями; возвращает (число значений, усечен ли вывод)"""
+        head = values if limit is None else islice(values, limit)
+        written = 0
+        out.write('[')
+        while True:
+            chunk = list(islice(head, 4096))
+            if not chunk:
+                break
+            out.write((', ' if written else '') + ', '.join(map(str, chunk)))
+            written += len(chunk)
+        truncated = limit is not None and next(values, None) is not None
+        if truncated:
+            out.write(', ...' if written else '...')
+        out.write(']')
+        return written, truncated
+    
+    def _write_levels(self, out: TextIO, max_nodes: Optional[int], max_depth: Optional[int]) -> None:
+        """Построчный вывод уровней, память O(ширины уровня)"""
+        queue = deque([self._root] if self._root else [])
         
-        lines = []
-        self._visualize_recursive(self.root, 0, 'root', lines)
-        print("\nВизуализация дерева:")
-        for line in lines:
-            print(line)
+        def level_values(width: int) -> Iterator[int]:
+            for _ in range(width):
+                node = queue.popleft()
+                yield from repeat(node.value, node.count)
+                if node.left:
+                    queue.append(node.left)
+                if node.right:
+                    queue.append(node.right)
+        
+        depth = 0
+        budget = max_nodes
+        while queue:
+            if max_depth is not None and depth >= max_depth:
+                out.write("...\n")
+                return
+            out.write(f"Уровень {depth}: ")
+            written, truncated = self._write_values(out, level_values(len(queue)), budget)
+            out.write("\n")
+            if truncated:
+                return
+            if budget is not None:
+                budget -= written
+            depth += 1
     
-    def _visualize_recursive(self, node: Optional[Node], depth: int, prefix: str, lines: List[str]) -> None:
-        if node is None:
+    def visualize(self, out: Optional[TextIO] = None, max_depth: Optional[int] = None,
+                  max_nodes: Optional[int] = None) -> None:
+        """Визуализация дерева в консоли
+        
+        Строки пишутся в out (по умолчанию sys.stdout) по мере обхода,
+        память O(высоты). Поддеревья глубже max_depth и узлы сверх
+        max_nodes заменяются многоточием.
+        """
+        out = out or sys.stdout
+        if not self._root:
+            out.write("Дерево пустое\n")
             return
         
-        indent = "  " * depth
-        lines.append(f"{indent}{prefix}: {node.value}")
+        out.write("\nВизуализация дерева:\n")
+        shown = 0
+        # В стеке лежат либо узлы (узел, глубина, префикс), либо готовые строки
+        stack = [(self._root, 0, 'root')]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                out.write(item)
+                continue
+            
+            if max_nodes is not None and shown >= max_nodes:
+                out.write("...\n")
+                return
+            node, depth, prefix = item
+            indent = "  " * depth
+            copies = f" (x{node.count})" if node.count > 1 else ""
+            out.write(f"{indent}{prefix}: {node.value}{copies}\n")
+            shown += 1
+            
+            if node.left or node.right:
+                if max_depth is not None and depth >= max_depth:
+                    out.write(f"{indent}  ...\n")
+                    continue
+                
+                if node.right:
+                    stack.append((node.right, depth + 1, 'R'))
+                else:
+                    stack.append(f"{indent}  R: None\n")
+                
+                if node.left:
+                    stack.append((node.left, depth + 1, 'L'))
+                else:
+                    stack.append(f"{indent}  L: None\n")
+    
+    # Формат файла dump(): заголовок (сигнатура, флаги, число узлов n),
+    # затем n значений int64 в прямом порядке обхода и n байт формы:
+    # бит 0 - есть левый потомок, бит 1 - есть правый.
+    # В режиме multiset за ними идут n счетчиков копий int64
+    _DUMP_HEADER = struct.Struct('<4sBq')
+    _DUMP_MAGIC = b'BTR1'
+    _FLAG_BALANCED = 1
+    _FLAG_MULTISET = 2
+    
+    def dump(self, path: str) -> None:
+        """Сохраняет дерево в компактный двоичный файл (значения - int64)
+        
+        Файл пишется во временный и атомарно заменяет path через
+        os.replace, так что сбой посреди записи оставляет прежний файл.
+        """
+        values = array('q')
+        counts = array('q')
+        shape = bytearray()
+        for node in self._nodes_preorder():
+            values.append(node.value)
+            counts.append(node.count)
+            shape.append((1 if node.left else 0) | (2 if node.right else 0))
+        if sys.byteorder == 'big':
+            values.byteswap()
+            counts.byteswap()
         
-        if node.left or node.right:
-            if node.left:
-                self._visualize_recursive(node.left, depth + 1, 'L', lines)
-            else:
-                lines.append(f"{indent}  L: None")
+        flags = ((self._FLAG_BALANCED if self.balanced else 0)
+                 | (self._FLAG_MULTISET if self.multiset else 0))
+        tmp = path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(self._DUMP_HEADER.pack(self._DUMP_MAGIC, flags, len(values)))
+            values.tofile(f)
+            f.write(shape)
+            if self.multiset:
+                counts.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    
+    @classmethod
+    def load(cls, path: str, **options) -> 'BinaryTree':
+        """Загружает дерево, сохраненное dump(), за один линейный проход
+        
+        Форма дерева восстанавливается как есть, без вставок и балансировки.
+        Остальные аргументы передаются конструктору.
+        """
+        with open(path, 'rb') as f, _gc_paused():
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                header_size = cls._DUMP_HEADER.size
+                if len(mm) < header_size:
+                    raise ValueError(f"{path}: не файл дерева")
+                magic, flags, count = cls._DUMP_HEADER.unpack_from(mm)
+                if magic != cls._DUMP_MAGIC:
+                    raise ValueError(f"{path}: не файл дерева")
+                # Значения и форма, у multiset еще и счетчики копий
+                expected = header_size + (17 if flags & cls._FLAG_MULTISET else 9) * count
+                if len(mm) != expected:
+                    raise ValueError(f"{path}: размер {len(mm)} байт вместо {expected}, файл поврежден")
+                
+                shape_start = header_size + 8 * count
+                shape = mm[shape_start:shape_start + count]
+                
+                options['balanced'] = bool(flags & cls._FLAG_BALANCED)
+                options['multiset'] = bool(flags & cls._FLAG_MULTISET)
+                tree = cls(**options)
+                
+                values = cls._int64_column(mm, header_size, count)
+                nodes = [Node(value) for value in values]
+                if isinstance(values, memoryview):
+                    values.release()
+                
+                if tree.multiset:
+                    counts = cls._int64_column(mm, shape_start + count, count)
+                    for node, copies in zip(nodes, counts):
+                        node.count = copies
+                    if isinstance(counts, memoryview):
+                        counts.release()
             
-            if node.right:
-                self._visualize_recursive(node.right, depth + 1, 'R', lines)
-            else:
-                lines.append(f"{indent}  R: None")
+            # Стек свободных мест под потомков: (родитель, является ли левым)
+            slots = []
+            for node, bits in zip(nodes, shape):
+                if slots:
+                    parent, is_left = slots.pop()
+                    if is_left:
+                        parent.left = node
+                    else:
+                        parent.right = node
+                if bits & 2:
+                    slots.append((node, False))
+                if bits & 1:
+                    slots.append((node, True))
+            
+            for node in reversed(nodes):
+                cls._update(node)
+        tree._root = nodes[0] if nodes else None
+        return tree
+    
+    @staticmethod
+    def _int64_column(mm: mmap.mmap, start: int, count: int):
+        """Столбец int64 из файла; на little-endian машинах - без копирования"""
+        end = start + 8 * count
+        if sys.byteorder == 'big':
+            column = array('q', mm[start:end])
+            column.byteswap()
+            return column
+        return memoryview(mm)[start:end].cast('q')
+
+
+class BalancedBinaryTree(BinaryTree):
+    """Самобалансирующееся (AVL) бинарное дерево поиска"""
+    def __init__(self, **options):
+        options['balanced'] = True
+        super().__init__(**options)
+
+def node_memory_usage(n: int = 100_000) -> Dict[str, float]:
+    """Средний объем памяти на узел в байтах: Node против узла с __dict__"""
+    class DictNode:
+        """Прежняя раскладка узла: атрибуты в __dict__"""
+        def __init__(self, value: int):
+            self.value = value
+            self.count = 1
+            self.left = None
+            self.right = None
+            self.height = 1
+            self.size = 1
+            self.full = 0
+    
+    # Значения создаются до замера, чтобы учитывались только сами узлы
+    values = list(range(n))
+    result = {}
+    for name, node_class in (('slots', Node), ('dict', DictNode)):
+        tracemalloc.start()
+        try:
+            nodes = [node_class(value) for value in values]
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del nodes
+        # Список ссылок на узлы (8 байт на элемент) в размер узла не входит
+        result[name] = current / n - 8
+    return result
+
+
+BENCH_SIZES = (10**3, 10**4, 10**5, 10**6, 10**7)
+BENCH_DISTRIBUTIONS = ('random', 'sorted', 'reversed', 'duplicates')
+# Несбалансированное дерево на упорядоченных данных вырождается в список,
+# и вставка становится квадратичной - такие замеры выше порога пропускаются
+DEGENERATE_LIMIT = 10**3
+BENCH_OPERATIONS = ('insert', 'search', 'search_many', 'inorder', 'preorder', 'postorder', 'level_order',
+                    'max_depth', 'count_full_nodes', 'is_symmetric', 'delete')
+
+
+def _bench_values(distribution: str, n: int, rng: random.Random) -> List[int]:
+    if distribution == 'random':
+        values = list(range(n))
+        rng.shuffle(values)
+        return values
+    if distribution == 'sorted':
+        return list(range(n))
+    if distribution == 'reversed':
+        return list(range(n, 0, -1))
+    if distribution == 'duplicates':
+        # около 100 повторов каждого ключа
+        return [rng.randrange(max(1, n // 100)) for _ in range(n)]
+    raise ValueError(f"неизвестное распределение: {distribution}")
+
+
+def _bench_measure(run, trace_memory: bool, fresh_run=None) -> Dict[str, float]:
+    """Время run() и пик памяти повторного прогона под tracemalloc
+    
+    run возвращает число выполненных операций. Для разрушающих операций
+    fresh_run() вне замера готовит новый экземпляр действия для повтора.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    count = run()
+    seconds = time.perf_counter() - start
+    result = {'ops': count, 'seconds': seconds,
+              'ops_per_sec': count / seconds if seconds else float('inf')}
+    
+    if trace_memory:
+        repeat_run = fresh_run() if fresh_run else run
+        gc.collect()
+        tracemalloc.start()
+        try:
+            repeat_run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['peak_bytes'] = peak
+    return result
+
+
+def _bench_distribution(values: List[int], probes: List[int], options: Dict[str, bool],
+                        trace_memory: bool) -> Iterator[Dict]:
+    """Замеры всех операций на одном наборе данных, в порядке BENCH_OPERATIONS"""
+    tree = BinaryTree(**options)
+    
+    def insert_all(target=tree):
+        for value in values:
+            target.insert(value)
+        return len(values)
+    
+    yield dict(op='insert', **_bench_measure(
+        insert_all, trace_memory, lambda: partial(insert_all, BinaryTree(**options))))
+    
+    def search():
+        for value in probes:
+            tree.contains(value)
+        return len(probes)
+    
+    yield dict(op='search', **_bench_measure(search, trace_memory))
+    
+    def search_many():
+        tree.contains_many(probes)
+        return len(probes)
+    
+    yield dict(op='search_many', **_bench_measure(search_many, trace_memory))
+    
+    for method in ('inorder', 'preorder', 'postorder', 'level_order'):
+        def traversal(method=method):
+            getattr(tree, method)()
+            return len(values)
+        yield dict(op=method, **_bench_measure(traversal, trace_memory))
+    
+    for method, times in (('max_depth', 10_000), ('count_full_nodes', 10_000), ('is_symmetric', 10)):
+        def repeated(method=method, times=times):
+            for _ in range(times):
+                getattr(tree, method)()
+            return times
+        yield dict(op=method, **_bench_measure(repeated, trace_memory))
+    
+    # Удаление разрушает дерево: для второго прогона нужна точная копия
+    with tempfile.TemporaryDirectory() as tmp:
+        copy_path = os.path.join(tmp, 'tree.bin')
+        if trace_memory:
+            tree.dump(copy_path)
+        
+        def delete_all(target=tree):
+            for value in probes:
+                target.delete(value)
+            return len(probes)
+        
+        yield dict(op='delete', **_bench_measure(
+            delete_all, trace_memory, lambda: partial(delete_all, BinaryTree.load(copy_path))))
+
+
+def benchmark_tree(sizes: Sequence[int] = BENCH_SIZES,
+                   distributions: Sequence[str] = BENCH_DISTRIBUTIONS,
+                   balanced: bool = False, trace_memory: bool = True,
+                   seed: int = 0, multiset: bool = False) -> Iterator[Dict]:
+    """Замеры операций BinaryTree, по одной записи-словарю на операцию
+    
+    Дерево строится вставками в порядке данных, поэтому его форма та же,
+    что у вызывающего кода. Поиск и удаление - по случайной выборке
+    из не более чем 100 000 значений.
+    """
+    for distribution in distributions:
+        for n in sizes:
+            options = {'balanced': balanced, 'multiset': multiset}
+            record = dict(options, distribution=distribution, size=n,
+                          python=platform.python_version())
+            if (not balanced and distribution in ('sorted', 'reversed')
+                    and n > DEGENERATE_LIMIT):
+                for op in BENCH_OPERATIONS:
+                    yield dict(record, op=op, skipped='degenerate')
+                continue
+            
+            rng = random.Random(seed)
+            values = _bench_values(distribution, n, rng)
+            probes = rng.sample(values, min(n, 100_000))
+            for result in _bench_distribution(values, probes, options, trace_memory):
+                yield dict(record, **result)
+
+
+def benchmark_main(argv: List[str]) -> None:
+    """Командная строка замеров: python PythonApplication3.py bench [параметры]"""
+    parser = argparse.ArgumentParser(prog='PythonApplication3.py bench',
+                                     description="Замеры BinaryTree (JSON Lines)")
+    parser.add_argument('--sizes', default=','.join(map(str, BENCH_SIZES)),
+                        help="размеры через запятую")
+    parser.add_argument('--distributions', default=','.join(BENCH_DISTRIBUTIONS),
+                        help="распределения через запятую")
+    parser.add_argument('--balanced', action='store_true', help="AVL-режим дерева")
+    parser.add_argument('--multiset', action='store_true', help="счетчики копий в узлах")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="не замерять пик памяти (вдвое быстрее)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="файл для результатов (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+    
+    sizes = [int(size) for size in args.sizes.split(',')]
+    distributions = args.distributions.split(',')
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for record in benchmark_tree(sizes, distributions, args.balanced,
+                                     not args.no_memory, args.seed, args.multiset):
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
 
 def task1():
     print("="*60)
@@ -428,4 +1515,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark_main(sys.argv[2:])
+    else:
+        main()
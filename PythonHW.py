@@ -1,8 +1,26 @@
+import atexit
+import calendar
+import contextlib
+import gc
+import heapq
 import json
 import os
+import queue
+import random
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import weakref
+from bisect import bisect_left, bisect_right
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 
 
 class EventType(Enum):
@@ -14,82 +32,380 @@ class EventType(Enum):
     OTHER = "Другое"
 
 
+class Recurrence(Enum):
+    DAILY = "Ежедневно"
+    WEEKLY = "Еженедельно"
+    MONTHLY = "Ежемесячно"
+    YEARLY = "Ежегодно"
+    
+    def dates(self, first: datetime, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Даты повторений серии, начатой в first, попадающие в [start, end]
+        
+        Номер первого подходящего повторения вычисляется сразу, так что
+        стоимость зависит только от числа дат в окне. Если дня first нет
+        в месяце (31-е, 29 февраля), берется последний день месяца.
+        """
+        if self in (Recurrence.DAILY, Recurrence.WEEKLY):
+            step = timedelta(days=1 if self is Recurrence.DAILY else 7)
+            date = first + max(0, -(-(start - first) // step)) * step
+            while date <= end:
+                yield date
+                date += step
+            return
+        
+        months = 1 if self is Recurrence.MONTHLY else 12
+        k = max(0, ((start.year - first.year) * 12 + start.month - first.month) // months)
+        while True:
+            total = first.month - 1 + k * months
+            year = first.year + total // 12
+            if year > end.year:
+                return
+            month = total % 12 + 1
+            date = first.replace(year=year, month=month,
+                                 day=min(first.day, calendar.monthrange(year, month)[1]))
+            if date > end:
+                return
+            if date >= start:
+                yield date
+            k += 1
+
+
+# Формат даты в файле событий
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def parse_date(text: str) -> datetime:
+    """Разбор даты формата ГГГГ-ММ-ДД ЧЧ:ММ
+    
+    Строки ровно этого вида разбирает datetime.fromisoformat (реализован
+    на C, в десятки раз быстрее strptime); остальное и ошибки - strptime.
+    """
+    if len(text) == 16 and text[4] == '-' and text[7] == '-' and text[10] == ' ' and text[13] == ':':
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            pass
+    return datetime.strptime(text, DATE_FORMAT)
+
+
+def format_date(date: datetime) -> str:
+    """Дата в формате файла событий без strftime"""
+    return f"{date.year:04d}-{date.month:02d}-{date.day:02d} {date.hour:02d}:{date.minute:02d}"
+
+
+def to_minutes(date: datetime) -> int:
+    """Момент времени в целых минутах от начала эпохи datetime (с точностью до минуты)"""
+    return date.toordinal() * 1440 + date.hour * 60 + date.minute
+
+
+# Начало полей даты, типа и продолжительности в строке JSON (UTF-8), записанной json.dumps
+DATE_KEY = b'"date": "'
+TYPE_KEY = b'"type": "'
+RECURRENCE_KEY = b'"recurrence": "'
+DURATION_RE = re.compile(rb'"duration_minutes": (\d+)')
+EVENT_TYPES = {event_type.value: event_type for event_type in EventType}
+EVENT_TYPES_UTF8 = {event_type.value.encode(): event_type for event_type in EventType}
+
+
 class Event:
+    """Событие органайзера
+    
+    Событие, прочитанное из снимка через from_json_line, сначала хранит
+    только дату, тип, продолжительность и исходную строку JSON в байтах
+    UTF-8 (str с кириллицей занимал бы по 2 байта на каждый символ);
+    название и описание разбираются из нее при первом обращении к любому
+    из них.
+    
+    Событие с recurrence - серия: хранится одной записью, а повторения
+    порождает occurrences() для окна запроса.
+    
+    Атрибуты хранятся в __slots__ без __dict__ - замер в benchmark_load().
+    """
+    __slots__ = ('_raw', '_title', '_event_type', '_date', '_duration_minutes', '_description',
+                 '_recurrence')
+    
     def __init__(self, title: str, event_type: EventType, date: datetime, 
-                 duration_minutes: int, description: str = ""):
-        self.title = title
-        self.event_type = event_type
-        self.date = date
-        self.duration_minutes = max(15, duration_minutes)  
-        self.description = description
+                 duration_minutes: int, description: str = "",
+                 recurrence: Optional[Recurrence] = None):
+        self._raw: Optional[bytes] = None
+        self._title = title
+        self._event_type = event_type
+        self._date = date
+        self._duration_minutes = max(15, duration_minutes)  
+        self._description = description
+        self._recurrence = recurrence
+    
+    @classmethod
+    def from_json_line(cls, line: bytes) -> 'Event':
+        """Ленивое событие из строки JSON в UTF-8: сразу разбираются дата, тип и продолжительность"""
+        pos = line.find(DATE_KEY)
+        type_pos = line.find(TYPE_KEY)
+        duration = DURATION_RE.search(line)
+        event_type = None
+        if type_pos >= 0:
+            type_pos += len(TYPE_KEY)
+            event_type = EVENT_TYPES_UTF8.get(line[type_pos:line.find(b'"', type_pos)])
+        # Серий немного, они разбираются сразу
+        if pos < 0 or event_type is None or duration is None or RECURRENCE_KEY in line:
+            return cls.from_dict(json.loads(line))
+        pos += len(DATE_KEY)
+        event = cls.__new__(cls)
+        event._raw = line
+        event._date = parse_date(line[pos:pos + 16].decode('ascii'))
+        event._event_type = event_type
+        event._duration_minutes = max(15, int(duration.group(1)))
+        event._recurrence = None
+        return event
+    
+    def _hydrate(self) -> None:
+        """Разбор отложенных полей из исходной строки JSON"""
+        data = json.loads(self._raw)
+        self._title = data["title"]
+        self._description = data.get("description", "")
+        # _raw сбрасывается последним: поток снимка видит либо строку, либо все поля
+        self._raw = None
+    
+    @property
+    def title(self) -> str:
+        if self._raw is not None:
+            self._hydrate()
+        return self._title
+    
+    @title.setter
+    def title(self, value: str) -> None:
+        if self._raw is not None:
+            self._hydrate()
+        self._title = value
+    
+    @property
+    def event_type(self) -> EventType:
+        return self._event_type
+    
+    @event_type.setter
+    def event_type(self, value: EventType) -> None:
+        if self._raw is not None:
+            self._hydrate()
+        self._event_type = value
+    
+    @property
+    def date(self) -> datetime:
+        return self._date
+    
+    @date.setter
+    def date(self, value: datetime) -> None:
+        if self._raw is not None:
+            self._hydrate()
+        self._date = value
+    
+    @property
+    def duration_minutes(self) -> int:
+        return self._duration_minutes
+    
+    @duration_minutes.setter
+    def duration_minutes(self, value: int) -> None:
+        if self._raw is not None:
+            self._hydrate()
+        self._duration_minutes = value
+    
+    @property
+    def description(self) -> str:
+        if self._raw is not None:
+            self._hydrate()
+        return self._description
+    
+    @description.setter
+    def description(self, value: str) -> None:
+        if self._raw is not None:
+            self._hydrate()
+        self._description = value
+    
+    @property
+    def recurrence(self) -> Optional[Recurrence]:
+        return self._recurrence
+    
+    @recurrence.setter
+    def recurrence(self, value: Optional[Recurrence]) -> None:
+        if self._raw is not None:
+            self._hydrate()
+        self._recurrence = value
+    
+    def copy(self) -> 'Event':
+        """Копия события; не разобранное событие копируется вместе с исходной строкой"""
+        event = Event.__new__(Event)
+        for name in Event.__slots__:
+            if hasattr(self, name):
+                setattr(event, name, getattr(self, name))
+        return event
+    
+    def occurrences(self, start: datetime, end: datetime) -> Iterator['Event']:
+        """Повторения с началом в [start, end]; разовое событие - оно само, если попадает"""
+        if self.recurrence is None:
+            if start <= self.date <= end:
+                yield self
+            return
+        for date in self.recurrence.dates(self.date, start, end):
+            yield Event(self.title, self.event_type, date, self.duration_minutes,
+                        self.description, self.recurrence)
     
     def to_dict(self) -> Dict:
         """Преобразование события в словарь для сохранения в JSON"""
-        return {
+        data = {
             "title": self.title,
             "type": self.event_type.value,
-            "date": self.date.strftime("%Y-%m-%d %H:%M"),
+            "date": format_date(self.date),
             "duration_minutes": self.duration_minutes,
             "description": self.description
         }
+        if self.recurrence is not None:
+            data["recurrence"] = self.recurrence.value
+        return data
+    
+    def to_json(self) -> str:
+        """Одна строка JSON; не разобранное событие отдает исходную строку"""
+        if self._raw is not None:
+            return self._raw.decode('utf-8')
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+    
+    @property
+    def end(self) -> datetime:
+        """Момент окончания события"""
+        return self.date + timedelta(minutes=self.duration_minutes)
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Event':
         """Создание события из словаря"""
         event_type = EventType(data["type"])
-        date = datetime.strptime(data["date"], "%Y-%m-%d %H:%M")
+        date = parse_date(data["date"])
         return cls(
             title=data["title"],
             event_type=event_type,
             date=date,
             duration_minutes=data["duration_minutes"],
-            description=data.get("description", "")
+            description=data.get("description", ""),
+            recurrence=Recurrence(data["recurrence"]) if data.get("recurrence") else None
         )
     
     def __str__(self) -> str:
         end_time = self.date + timedelta(minutes=self.duration_minutes)
-        return (f"{self.event_type.value}: {self.title}\n"
+        text = (f"{self.event_type.value}: {self.title}\n"
                 f"  Дата: {self.date.strftime('%d.%m.%Y %H:%M')} - "
                 f"{end_time.strftime('%H:%M')} ({self.duration_minutes} мин.)\n"
                 f"  Описание: {self.description}")
+        if self.recurrence is not None:
+            text += f"\n  Повтор: {self.recurrence.value}"
+        return text
 
 
-class Organizer:
-    def __init__(self, filename: str = "events.json"):
-        self.filename = filename
-        self.events: List[Event] = []
-        self.load_events()
+# Поля события, которые меняет edit_event
+EDITABLE_FIELDS = ('title', 'event_type', 'date', 'duration_minutes', 'description', 'recurrence')
+# С какого размера пачку выгоднее добавить одной сортировкой, чем вставками
+BULK_INSERT_MIN = 64
+# Первая строка снимка; дальше по одному событию JSON на строку и "]}"
+SNAPSHOT_HEADER = re.compile(r'\{"seq": (\d+), "events": \[$')
+
+
+class BaseOrganizer(ABC):
+    """Общий интерфейс хранилищ событий: запросы, изменения и меню main()
     
-    def load_events(self) -> None:
-        """Загрузка событий из файла"""
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.events = [Event.from_dict(event_data) for event_data in data]
-                print(f"Загружено {len(self.events)} событий")
-            except Exception as e:
-                print(f"Ошибка при загрузке файла: {e}")
-                self.events = []
-        else:
-            print("Файл с событиями не найден, создан новый список")
+    Хранилище задает events (события в порядке дат: len, индекс, обход)
+    и абстрактные методы; просмотр, ближайшие события, разворачивание
+    серий и поиск конфликтов общие.
+    """
+    events: Sequence[Event]
     
-    def save_events(self) -> None:
-        """Сохранение событий в файл"""
-        try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                json.dump([event.to_dict() for event in self.events], 
-                         f, ensure_ascii=False, indent=2)
-            print("События сохранены")
-        except Exception as e:
-            print(f"Ошибка при сохранении: {e}")
+    @abstractmethod
+    def load_events(self) -> None: ...
     
-    def add_event(self, event: Event) -> None:
-        """Добавление нового события"""
-        self.events.append(event)
-        self.events.sort(key=lambda x: x.date)
-        self.save_events()
-        print("Событие добавлено!")
+    @abstractmethod
+    def save_events(self) -> None: ...
+    
+    @abstractmethod
+    def flush(self) -> None:
+        """Дожидается, пока все изменения дойдут до хранилища"""
+    
+    @abstractmethod
+    def compact(self, background: bool = True) -> None: ...
+    
+    @abstractmethod
+    def close(self) -> None:
+        """Сохраняет все изменения и освобождает файлы; вызывается и при выходе"""
+    
+    @abstractmethod
+    def events_between(self, start: datetime, end: datetime,
+                       event_type: Optional[EventType] = None) -> List[Event]: ...
+    
+    @abstractmethod
+    def events_on(self, day: datetime, event_type: Optional[EventType] = None) -> List[Event]: ...
+    
+    @abstractmethod
+    def events_of_type(self, event_type: EventType) -> List[Event]: ...
+    
+    @abstractmethod
+    def find_overlapping(self, start: datetime, end: datetime) -> List[Event]: ...
+    
+    @abstractmethod
+    def add_event(self, event: Event) -> None: ...
+    
+    @abstractmethod
+    def add_events(self, events: Iterable[Event]) -> int: ...
+    
+    @abstractmethod
+    def edit_event(self, index: int, **kwargs) -> bool: ...
+    
+    @abstractmethod
+    def delete_event(self, index: int) -> bool: ...
+    
+    @abstractmethod
+    def _series_list(self) -> List[Event]:
+        """Все серии (события с recurrence)"""
+    
+    def _with_series(self, found: List[Event], start: datetime, end: datetime,
+                     event_type: Optional[EventType] = None, overlap: bool = False) -> List[Event]:
+        """События из индекса, где записи серий заменены их повторениями в окне
+        
+        Запись серии стоит в индексе на дате первого повторения; вместо нее
+        берутся повторения с началом в [start, end] (при overlap - все,
+        пересекающие [start, end)), так что стоимость зависит от окна,
+        а не от общего числа повторений.
+        """
+        series = [e for e in self._series_list()
+                  if event_type is None or e.event_type == event_type]
+        if not series:
+            return found
+        events = [e for e in found if e.recurrence is None]
+        for master in series:
+            if overlap:
+                window = master.occurrences(start - timedelta(minutes=master.duration_minutes), end)
+                events.extend(o for o in window if o.end > start and o.date < end)
+            else:
+                events.extend(master.occurrences(start, end))
+        events.sort(key=lambda x: x.date)
+        return events
+    
+    def find_conflicts(self) -> List[Tuple[Event, Event]]:
+        """Все пары пересекающихся событий одним проходом по events, O(n log n + k)
+        
+        Серия участвует только первым повторением: бесконечные серии не
+        разворачиваются.
+        """
+        conflicts = []
+        # Куча (конец, номер, событие) еще не закончившихся событий
+        active: List[Tuple[int, int, Event]] = []
+        for number, event in enumerate(self.events):
+            key = to_minutes(event.date)
+            while active and active[0][0] <= key:
+                heapq.heappop(active)
+            for _, _, other in active:
+                conflicts.append((other, event))
+            heapq.heappush(active, (key + event.duration_minutes, number, event))
+        return conflicts
+    
+    @staticmethod
+    def _report_conflicts(conflicts: List[Event]) -> None:
+        if conflicts:
+            print(f"Внимание: пересекается с {len(conflicts)} событиями:")
+            for other in conflicts:
+                print(f"  {other.date.strftime('%d.%m.%Y %H:%M')} {other.title}")
     
     def view_events(self, filter_date: Optional[datetime] = None, 
                    filter_type: Optional[EventType] = None) -> None:
@@ -101,16 +417,9 @@ class Organizer:
         filtered_events = self.events
         
         if filter_date:
-            filtered_events = [
-                e for e in filtered_events 
-                if e.date.date() == filter_date.date()
-            ]
-        
-        if filter_type:
-            filtered_events = [
-                e for e in filtered_events 
-                if e.event_type == filter_type
-            ]
+            filtered_events = self.events_on(filter_date, filter_type)
+        elif filter_type:
+            filtered_events = self.events_of_type(filter_type)
         
         if not filtered_events:
             if filter_date or filter_type:
@@ -123,24 +432,498 @@ class Organizer:
         for i, event in enumerate(filtered_events, 1):
             print(f"\n{i}. {event}")
     
+    def get_upcoming_events(self, days: int = 7) -> List[Event]:
+        """Получение событий на ближайшие дни"""
+        now = datetime.now()
+        future_date = now + timedelta(days=days)
+        
+        return self.events_between(now, future_date)
+
+
+class Organizer(BaseOrganizer):
+    """Органайзер событий с журналом изменений
+    
+    Файл filename - снимок {"seq": N, "events": [...]} с одним событием
+    на строку (старый формат - просто список событий). Каждое добавление,
+    изменение и удаление - одна строка JSON с номером seq в filename +
+    ".journal", так что изменение стоит O(1) записанных байт. При загрузке
+    к снимку применяются записи журнала с seq больше, чем у снимка. Каждые
+    compact_every записей журнал сворачивается в новый снимок в фоновом
+    потоке.
+    
+    Записи журнала пишет фоновый поток: изменение только ставит строку в
+    очередь, а все строки, накопившиеся за время предыдущей записи, уходят
+    в файл одной записью. flush() дожидается записи всего поставленного,
+    close() еще и закрывает журнал; при выходе из интерпретатора close()
+    вызывается для всех органайзеров сам. fsync_every=N вызывает fsync
+    журнала раз в N записей (0 - не вызывать).
+    """
+    COMPACT_EVERY = 1000
+    
+    def __init__(self, filename: str = "events.json", fsync_every: int = 0,
+                 compact_every: int = COMPACT_EVERY):
+        self.filename = filename
+        self.journal_filename = filename + ".journal"
+        self.fsync_every = fsync_every
+        self.compact_every = compact_every
+        self.events: List[Event] = []
+        # Начала событий в минутах, параллельно отсортированному self.events
+        self._starts: List[int] = []
+        # Тип -> (начала, события) того же вида только для событий этого типа
+        self._by_type: Dict[EventType, Tuple[List[int], List[Event]]] = {}
+        # Индекс интервалов: группы по продолжительности d с d.bit_length() == b,
+        # в каждой такие же параллельные списки (начала, события)
+        self._by_length: Dict[int, Tuple[List[int], List[Event]]] = {}
+        # Серии (события с recurrence); их повторения порождаются в запросах
+        self._series: List[Event] = []
+        self._seq = 0
+        self._pending = 0
+        self._unsynced = 0
+        self._journal = None
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._compaction: Optional[threading.Thread] = None
+        _open_organizers.add(self)
+        self.load_events()
+    
+    def load_events(self) -> None:
+        """Загрузка снимка из файла и применение журнала"""
+        snapshot_seq = 0
+        if os.path.exists(self.filename):
+            try:
+                snapshot_seq = self._read_snapshot()
+                self.events.sort(key=lambda x: x.date)
+                self._reindex()
+            except Exception as e:
+                print(f"Ошибка при загрузке файла: {e}")
+                self.events = []
+                self._reindex()
+                return
+        elif not os.path.exists(self.journal_filename):
+            print("Файл с событиями не найден, создан новый список")
+            return
+        
+        self._seq = snapshot_seq
+        # .old остается, если фоновое сворачивание не успело записать снимок
+        for path in (self.journal_filename + ".old", self.journal_filename):
+            if os.path.exists(path):
+                self._pending += self._replay(path)
+        print(f"Загружено {len(self.events)} событий")
+    
+    def _read_snapshot(self) -> int:
+        """Потоковое чтение снимка в self.events; возвращает seq снимка
+        
+        Строки событий только сохраняются, разбирается из них одна дата, так
+        что индекс по датам строится до разбора остальных полей. Файлы
+        старого формата (список или снимок с отступами) читаются json.load.
+        """
+        with open(self.filename, 'rb') as f:
+            match = SNAPSHOT_HEADER.match(f.readline().decode('utf-8').rstrip('\r\n'))
+            if match is None:
+                f.seek(0)
+                data = json.load(f)
+                seq = 0
+                if isinstance(data, dict):
+                    seq = data["seq"]
+                    data = data["events"]
+                self.events = [Event.from_dict(event_data) for event_data in data]
+                return seq
+            
+            events = []
+            for line in f:
+                line = line.rstrip(b'\r\n')
+                if line == b']}':
+                    break
+                if line.endswith(b','):
+                    line = line[:-1]
+                if line:
+                    events.append(Event.from_json_line(line))
+            self.events = events
+            return int(match.group(1))
+    
+    def _replay(self, path: str) -> int:
+        """Применение записей журнала новее загруженного состояния"""
+        applied = 0
+        offset = 0
+        # Подряд идущие добавления применяются одной пачкой
+        added: List[Event] = []
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError
+                    record = json.loads(line)
+                except ValueError:
+                    # Недописанная после сбоя строка: отрезаем, чтобы новые записи не склеились с ней
+                    with open(path, 'r+b') as tail:
+                        tail.truncate(offset)
+                    break
+                offset += len(line)
+                if record["seq"] <= self._seq:
+                    continue
+                op = record["op"]
+                if op == "add":
+                    added.append(Event.from_dict(record["event"]))
+                elif added:
+                    self._insert_many(added)
+                    added = []
+                if op == "edit":
+                    event = Event.from_dict(record["event"])
+                    self._update(record["index"],
+                                 {name: getattr(event, name) for name in EDITABLE_FIELDS})
+                elif op == "delete":
+                    self._remove(record["index"])
+                self._seq = record["seq"]
+                applied += 1
+        self._insert_many(added)
+        return applied
+    
+    def _log(self, op: str, **fields) -> None:
+        """Ставит одну запись журнала в очередь фонового писателя"""
+        self._seq += 1
+        self._queue.put(json.dumps({"seq": self._seq, "op": op, **fields},
+                                   ensure_ascii=False) + "\n")
+        self._pending += 1
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_journal, daemon=True)
+            self._writer.start()
+    
+    def _write_journal(self) -> None:
+        """Цикл фонового писателя журнала; None в очереди останавливает его"""
+        while True:
+            lines = [self._queue.get()]
+            if lines[0] is None:
+                self._queue.task_done()
+                return
+            # Все, что накопилось, пока шла прошлая запись, уходит одной записью
+            while True:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if self._journal is None:
+                    self._journal = open(self.journal_filename, 'a', encoding='utf-8')
+                self._journal.write("".join(lines))
+                self._journal.flush()
+                self._unsynced += len(lines)
+                if self.fsync_every and self._unsynced >= self.fsync_every:
+                    os.fsync(self._journal.fileno())
+                    self._unsynced = 0
+            except Exception as e:
+                print(f"Ошибка при записи журнала: {e}")
+            finally:
+                for _ in lines:
+                    self._queue.task_done()
+    
+    def flush(self) -> None:
+        """Дожидается записи всех изменений в журнал и фонового сворачивания"""
+        self._queue.join()
+        self._wait_compaction()
+    
+    def close(self) -> None:
+        """Дописывает журнал, останавливает писателя и закрывает файл журнала"""
+        self.flush()
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        self._close_journal()
+    
+    def _compacting(self) -> bool:
+        """Пишется ли снимок в фоновом потоке"""
+        return self._compaction is not None and self._compaction.is_alive()
+    
+    def _maybe_compact(self) -> None:
+        """Сворачивание журнала, если накопилось compact_every записей
+        
+        Пока предыдущий снимок еще пишется, журнал просто растет дальше,
+        чтобы изменение не ждало фоновый поток.
+        """
+        if self._pending >= self.compact_every and not self._compacting():
+            self.compact()
+    
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            if self._unsynced:
+                os.fsync(self._journal.fileno())
+                self._unsynced = 0
+            self._journal.close()
+            self._journal = None
+    
+    def compact(self, background: bool = True) -> None:
+        """Сворачивает журнал в снимок
+        
+        Текущий журнал переименовывается в .old, новые записи идут в
+        пустой журнал, а снимок пишется во временный файл и атомарно
+        заменяет filename через os.replace, после чего .old удаляется.
+        
+        Здесь берется только копия списка событий, JSON строит поток
+        снимка. Пока он работает, _update меняет не сами события из
+        копии, а их копии (copy-on-write).
+        """
+        # Журнал закрывается только после того, как писатель дописал очередь
+        self.flush()
+        data = list(self.events)
+        seq = self._seq
+        self._close_journal()
+        old = self.journal_filename + ".old"
+        if os.path.exists(self.journal_filename):
+            if os.path.exists(old):
+                # Предыдущее сворачивание не завершилось - сохраняем его записи
+                with open(old, 'a', encoding='utf-8') as dst, \
+                        open(self.journal_filename, 'r', encoding='utf-8') as src:
+                    shutil.copyfileobj(src, dst)
+                os.remove(self.journal_filename)
+            else:
+                os.replace(self.journal_filename, old)
+        self._pending = 0
+        if background:
+            self._compaction = threading.Thread(target=self._write_snapshot,
+                                                args=(data, seq, old), daemon=True)
+            self._compaction.start()
+        else:
+            self._write_snapshot(data, seq, old)
+    
+    def _wait_compaction(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+    
+    def _write_snapshot(self, data: List[Event], seq: int, old: str) -> None:
+        """Атомарная запись снимка (выполняется и в фоновом потоке)"""
+        tmp = self.filename + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(f'{{"seq": {seq}, "events": [\n')
+                for i, event in enumerate(data):
+                    line = event.to_json()
+                    f.write(line if i == 0 else ",\n" + line)
+                f.write('\n]}\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.filename)
+            if os.path.exists(old):
+                os.remove(old)
+        except Exception as e:
+            print(f"Ошибка при сохранении: {e}")
+    
+    def save_events(self) -> None:
+        """Сохранение всех событий в снимок и очистка журнала"""
+        try:
+            self.compact(background=False)
+            print("События сохранены")
+        except Exception as e:
+            print(f"Ошибка при сохранении: {e}")
+    
+    @staticmethod
+    def _position(starts: List[int], events: List[Event], event: Event, key: int) -> int:
+        """Место для event в отсортированных по дате списках, после событий с той же датой"""
+        lo = bisect_left(starts, key)
+        i = bisect_right(starts, key, lo)
+        # В пределах одной минуты порядок уточняется по секундам
+        while i > lo and events[i - 1].date > event.date:
+            i -= 1
+        return i
+    
+    def _insert(self, event: Event) -> None:
+        """Вставка на место по дате за O(log n) сравнений"""
+        key = to_minutes(event.date)
+        i = self._position(self._starts, self.events, event, key)
+        self.events.insert(i, event)
+        self._starts.insert(i, key)
+        self._index_secondary(event, key)
+        if event.recurrence is not None:
+            self._series.append(event)
+    
+    def _secondary(self, event: Event) -> Tuple[Tuple[List[int], List[Event]], ...]:
+        """Списки индексов по типу и по продолжительности, в которые входит event"""
+        return (self._by_type.setdefault(event.event_type, ([], [])),
+                self._by_length.setdefault(event.duration_minutes.bit_length(), ([], [])))
+    
+    def _index_secondary(self, event: Event, key: int, index: Optional[int] = None) -> None:
+        """Добавляет event в индексы по типу и продолжительности
+        
+        Без index event встает после событий с той же датой, как в _insert.
+        Если event уже стоит в self.events[index], среди событий своей
+        минуты он занимает то же место, что и в self.events.
+        """
+        if index is not None:
+            earlier = self.events[bisect_left(self._starts, key):index]
+            length = event.duration_minutes.bit_length()
+            ranks = (sum(1 for e in earlier if e.event_type == event.event_type),
+                     sum(1 for e in earlier if e.duration_minutes.bit_length() == length))
+        for n, (starts, events) in enumerate(self._secondary(event)):
+            if index is None:
+                i = self._position(starts, events, event, key)
+            else:
+                i = bisect_left(starts, key) + ranks[n]
+            events.insert(i, event)
+            starts.insert(i, key)
+    
+    def _unindex_secondary(self, event: Event, key: int) -> None:
+        for starts, events in self._secondary(event):
+            i = bisect_left(starts, key)
+            while events[i] is not event:
+                i += 1
+            del starts[i]
+            del events[i]
+    
+    def _insert_many(self, events: List[Event]) -> None:
+        """Вставка пачки событий: по одному или одной сортировкой, если пачка большая"""
+        if len(events) < BULK_INSERT_MIN:
+            for event in events:
+                self._insert(event)
+        else:
+            # Устойчивая сортировка дает тот же порядок, что и вставки по одному
+            self.events.extend(events)
+            self.events.sort(key=lambda x: x.date)
+            self._reindex()
+    
+    def _update(self, index: int, changes: Dict) -> Event:
+        event = self.events[index]
+        if self._compacting():
+            # Поток снимка читает прежний объект - меняется его копия
+            event = event.copy()
+            self._replace(index, event)
+        if 'date' in changes and changes['date'] != event.date:
+            self._remove(index)
+            for name, value in changes.items():
+                setattr(event, name, value)
+            self._insert(event)
+        elif any(name in changes and changes[name] != getattr(event, name)
+                 for name in ('event_type', 'duration_minutes')):
+            # Порядок по дате прежний, меняются только индексы по типу и продолжительности
+            key = self._starts[index]
+            self._unindex_secondary(event, key)
+            for name, value in changes.items():
+                setattr(event, name, value)
+            self._index_secondary(event, key, index)
+        else:
+            # Дата, тип и продолжительность не меняются - порядок и индексы остаются прежними
+            for name, value in changes.items():
+                setattr(event, name, value)
+        if event.recurrence is None and event in self._series:
+            self._series.remove(event)
+        elif event.recurrence is not None and event not in self._series:
+            self._series.append(event)
+        return event
+    
+    def _replace(self, index: int, event: Event) -> None:
+        """Ставит event на место self.events[index] во всех индексах"""
+        old = self.events[index]
+        key = self._starts[index]
+        self.events[index] = event
+        for starts, events in self._secondary(old):
+            i = bisect_left(starts, key)
+            while events[i] is not old:
+                i += 1
+            events[i] = event
+        if old.recurrence is not None:
+            self._series[self._series.index(old)] = event
+    
+    def _remove(self, index: int) -> Event:
+        event = self.events.pop(index)
+        self._unindex_secondary(event, self._starts.pop(index))
+        if event.recurrence is not None:
+            self._series.remove(event)
+        return event
+    
+    def _reindex(self) -> None:
+        """Перестройка всех индексов после сортировки self.events"""
+        self._starts = [to_minutes(e.date) for e in self.events]
+        self._by_type = {}
+        self._by_length = {}
+        self._series = []
+        for key, event in zip(self._starts, self.events):
+            for starts, events in self._secondary(event):
+                starts.append(key)
+                events.append(event)
+            if event.recurrence is not None:
+                self._series.append(event)
+    
+    def _index_for(self, event_type: Optional[EventType]) -> Tuple[List[int], List[Event]]:
+        """Параллельные списки (начала, события): все события или только одного типа"""
+        if event_type is None:
+            return self._starts, self.events
+        return self._by_type.get(event_type, ([], []))
+    
+    def events_between(self, start: datetime, end: datetime,
+                       event_type: Optional[EventType] = None) -> List[Event]:
+        """События (только типа event_type, если он задан), начинающиеся в [start, end], за O(log n + k)"""
+        starts, events = self._index_for(event_type)
+        lo = to_minutes(start)
+        if start.second or start.microsecond:
+            lo += 1
+        i = bisect_left(starts, lo)
+        j = bisect_right(starts, to_minutes(end))
+        return self._with_series(events[i:j], start, end, event_type)
+    
+    def events_on(self, day: datetime, event_type: Optional[EventType] = None) -> List[Event]:
+        """События (только типа event_type, если он задан), начинающиеся в тот же день, что и day"""
+        starts, events = self._index_for(event_type)
+        lo = day.toordinal() * 1440
+        i = bisect_left(starts, lo)
+        j = bisect_left(starts, lo + 1440)
+        start = datetime(day.year, day.month, day.day)
+        return self._with_series(events[i:j], start,
+                                 start + timedelta(days=1, microseconds=-1), event_type)
+    
+    def _series_list(self) -> List[Event]:
+        return self._series
+    
+    def events_of_type(self, event_type: EventType) -> List[Event]:
+        """События одного типа в порядке дат, O(k)"""
+        return list(self._index_for(event_type)[1])
+    
+    def find_overlapping(self, start: datetime, end: datetime) -> List[Event]:
+        """События, пересекающиеся с интервалом [start, end), в порядке дат
+        
+        В группе продолжительностей b все события короче 2**b минут, поэтому
+        кандидаты - события, начавшиеся не раньше start - 2**b; бисекция
+        по группам дает O(log n + k) с запасом не больше одной группы.
+        """
+        lo = to_minutes(start)
+        hi = to_minutes(end)
+        found = []
+        for length, (starts, events) in self._by_length.items():
+            i = bisect_right(starts, lo - (1 << length))
+            j = bisect_left(starts, hi)
+            for k in range(i, j):
+                if starts[k] + events[k].duration_minutes > lo:
+                    found.append(events[k])
+        found.sort(key=lambda x: x.date)
+        return self._with_series(found, start, end, overlap=True)
+    
+    def add_event(self, event: Event) -> None:
+        """Добавление нового события"""
+        conflicts = self.find_overlapping(event.date, event.end)
+        self._insert(event)
+        self._log("add", event=event.to_dict())
+        self._maybe_compact()
+        print("Событие добавлено!")
+        self._report_conflicts(conflicts)
+    
+    def add_events(self, events: Iterable[Event]) -> int:
+        """Массовое добавление событий за O((n + k) log(n + k))"""
+        events = list(events)
+        self._insert_many(events)
+        for event in events:
+            self._log("add", event=event.to_dict())
+        self._maybe_compact()
+        print(f"Добавлено {len(events)} событий")
+        return len(events)
+    
     def edit_event(self, index: int, **kwargs) -> bool:
         """Редактирование события по индексу"""
         if 0 <= index < len(self.events):
-            event = self.events[index]
-            
-            if 'title' in kwargs:
-                event.title = kwargs['title']
-            if 'event_type' in kwargs:
-                event.event_type = kwargs['event_type']
-            if 'date' in kwargs:
-                event.date = kwargs['date']
-            if 'duration_minutes' in kwargs:
-                event.duration_minutes = max(15, kwargs['duration_minutes'])
-            if 'description' in kwargs:
-                event.description = kwargs['description']
+            changes = {name: kwargs[name] for name in EDITABLE_FIELDS if name in kwargs}
+            if 'duration_minutes' in changes:
+                changes['duration_minutes'] = max(15, changes['duration_minutes'])
             
-            self.events.sort(key=lambda x: x.date)
-            self.save_events()
+            event = self._update(index, changes)
+            self._log("edit", index=index, event=event.to_dict())
+            self._maybe_compact()
             print("Событие отредактировано!")
             return True
         else:
@@ -150,25 +933,388 @@ class Organizer:
     def delete_event(self, index: int) -> bool:
         """Удаление события по индексу"""
         if 0 <= index < len(self.events):
-            event = self.events.pop(index)
-            self.save_events()
+            event = self._remove(index)
+            self._log("delete", index=index)
+            self._maybe_compact()
             print(f"Событие '{event.title}' удалено!")
             return True
         else:
             print("Неверный индекс события")
             return False
     
-    def get_upcoming_events(self, days: int = 7) -> List[Event]:
-        """Получение событий на ближайшие дни"""
-        now = datetime.now()
-        future_date = now + timedelta(days=days)
+# Органайзеры, чьи очереди журнала дописываются при выходе из интерпретатора
+_open_organizers: "weakref.WeakSet[Organizer]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_organizers() -> None:
+    # Писатель журнала - демон: обработчики atexit выполняются, пока он еще жив
+    for organizer in list(_open_organizers):
+        organizer.close()
+
+
+class SqliteEvents:
+    """События SqliteOrganizer в порядке дат: длина, индекс и обход без загрузки всей базы"""
+    def __init__(self, organizer: 'SqliteOrganizer'):
+        self._organizer = organizer
+    
+    def __len__(self) -> int:
+        return self._organizer._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    
+    def __bool__(self) -> bool:
+        return self._organizer._conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM events)").fetchone()[0] == 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            positions = range(*index.indices(len(self)))
+            if not positions:
+                return []
+            # Одним запросом читается отрезок между крайними номерами в любом направлении
+            lo = min(positions[0], positions[-1])
+            hi = max(positions[0], positions[-1])
+            events = self._organizer._select(
+                "ORDER BY start, id LIMIT ? OFFSET ?", (hi - lo + 1, lo))
+            return [events[i - lo] for i in positions]
+        if index < 0:
+            index += len(self)
+        row = self._organizer._row_at(index)
+        if row is None:
+            raise IndexError("индекс события вне диапазона")
+        return self._organizer._event(row)
+    
+    def __iter__(self) -> Iterator[Event]:
+        return self._organizer._iter_select("ORDER BY start, id")
+
+
+class SqliteOrganizer(BaseOrganizer):
+    """Органайзер с хранением событий в базе SQLite
+    
+    В памяти хранятся только результаты запросов: фильтры по дате и типу,
+    ближайшие события и пересечения выполняются запросами по индексам
+    start (минуты to_minutes) и type. Изменение одного события - одна
+    строка таблицы. Внутри with organizer.batch(): изменения фиксируются
+    одной транзакцией. events - не список, а SqliteEvents.
+    """
+    def __init__(self, filename: str = "events.db"):
+        self.filename = filename
+        self._conn = sqlite3.connect(filename)
+        self._batch_depth = 0
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY,
+                start INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                type TEXT NOT NULL,
+                date TEXT NOT NULL,
+                duration_minutes INTEGER NOT NULL,
+                description TEXT NOT NULL,
+                recurrence TEXT,
+                bucket INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS events_start ON events (start, id);
+            CREATE INDEX IF NOT EXISTS events_type ON events (type, start, id);
+        """)
+        # Базы, созданные до появления серий и групп продолжительности
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(events)")}
+        if 'recurrence' not in columns:
+            self._conn.execute("ALTER TABLE events ADD COLUMN recurrence TEXT")
+        if 'bucket' not in columns:
+            self._conn.execute("ALTER TABLE events ADD COLUMN bucket INTEGER NOT NULL DEFAULT 0")
+            self._conn.executemany(
+                "UPDATE events SET bucket = ? WHERE id = ?",
+                [(duration.bit_length(), row_id) for row_id, duration
+                 in self._conn.execute("SELECT id, duration_minutes FROM events").fetchall()])
+            self._conn.execute("DROP INDEX IF EXISTS events_duration")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS events_bucket ON events (bucket, start, id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS events_series ON events (recurrence) "
+                           "WHERE recurrence IS NOT NULL")
+        self._conn.commit()
+        self.events = SqliteEvents(self)
+        self.load_events()
+    
+    def load_events(self) -> None:
+        """Данные читаются запросами по мере надобности, здесь только подсчет"""
+        print(f"Загружено {len(self.events)} событий")
+    
+    def save_events(self) -> None:
+        """Фиксация незавершенной транзакции"""
+        try:
+            self._conn.commit()
+            print("События сохранены")
+        except sqlite3.Error as e:
+            print(f"Ошибка при сохранении: {e}")
+    
+    def flush(self) -> None:
+        """Фиксация незавершенной транзакции"""
+        self._conn.commit()
+    
+    def compact(self, background: bool = True) -> None:
+        """Сжатие файла базы (VACUUM)"""
+        self._conn.commit()
+        self._conn.execute("VACUUM")
+    
+    def close(self) -> None:
+        """Фиксация транзакции и закрытие базы"""
+        self._conn.commit()
+        self._conn.close()
+    
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Все изменения внутри блока - одна транзакция; при исключении откатываются"""
+        self._batch_depth += 1
+        try:
+            yield
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._conn.rollback()
+            raise
+        self._batch_depth -= 1
+        self._commit()
+    
+    def _commit(self) -> None:
+        if not self._batch_depth:
+            self._conn.commit()
+    
+    @staticmethod
+    def _row(event: Event) -> Tuple:
+        return (to_minutes(event.date), event.title, event.event_type.value,
+                format_date(event.date), event.duration_minutes, event.description,
+                event.recurrence.value if event.recurrence else None,
+                event.duration_minutes.bit_length())
+    
+    @staticmethod
+    def _event(row: Tuple) -> Event:
+        title, event_type, date, duration_minutes, description, recurrence = row[-6:]
+        return Event(title, EVENT_TYPES[event_type], parse_date(date), duration_minutes, description,
+                     Recurrence(recurrence) if recurrence else None)
+    
+    def _iter_select(self, where: str, params: Tuple = ()) -> Iterator[Event]:
+        cursor = self._conn.execute(
+            "SELECT title, type, date, duration_minutes, description, recurrence FROM events "
+            + where, params)
+        for row in cursor:
+            yield self._event(row)
+    
+    def _select(self, where: str, params: Tuple = ()) -> List[Event]:
+        return list(self._iter_select(where, params))
+    
+    def _row_at(self, index: int) -> Optional[Tuple]:
+        """(id, поля события) для события с номером index в порядке дат"""
+        if index < 0:
+            return None
+        return self._conn.execute(
+            "SELECT id, title, type, date, duration_minutes, description, recurrence FROM events "
+            "ORDER BY start, id LIMIT 1 OFFSET ?", (index,)).fetchone()
+    
+    def _series_list(self) -> List[Event]:
+        return self._select("WHERE recurrence IS NOT NULL")
+    
+    @staticmethod
+    def _type_filter(event_type: Optional[EventType]) -> Tuple[str, Tuple]:
+        if event_type is None:
+            return "", ()
+        return " AND type = ?", (event_type.value,)
+    
+    def events_between(self, start: datetime, end: datetime,
+                       event_type: Optional[EventType] = None) -> List[Event]:
+        """События (только типа event_type, если он задан), начинающиеся в [start, end]"""
+        lo = to_minutes(start)
+        if start.second or start.microsecond:
+            lo += 1
+        condition, params = self._type_filter(event_type)
+        found = self._select("WHERE start BETWEEN ? AND ?" + condition + " ORDER BY start, id",
+                             (lo, to_minutes(end)) + params)
+        return self._with_series(found, start, end, event_type)
+    
+    def events_on(self, day: datetime, event_type: Optional[EventType] = None) -> List[Event]:
+        """События (только типа event_type, если он задан), начинающиеся в тот же день, что и day"""
+        lo = day.toordinal() * 1440
+        condition, params = self._type_filter(event_type)
+        found = self._select("WHERE start >= ? AND start < ?" + condition + " ORDER BY start, id",
+                             (lo, lo + 1440) + params)
+        start = datetime(day.year, day.month, day.day)
+        return self._with_series(found, start,
+                                 start + timedelta(days=1, microseconds=-1), event_type)
+    
+    def events_of_type(self, event_type: EventType) -> List[Event]:
+        """События одного типа в порядке дат"""
+        return self._select("WHERE type = ? ORDER BY start, id", (event_type.value,))
+    
+    def find_overlapping(self, start: datetime, end: datetime) -> List[Event]:
+        """События, пересекающиеся с интервалом [start, end), в порядке дат
+        
+        Те же группы продолжительностей, что и в Organizer: столбец bucket
+        равен duration_minutes.bit_length(), и в группе b кандидаты начинаются
+        не раньше start - 2**b. На каждую непустую группу - один запрос по
+        диапазону индекса events_bucket (bucket, start), так что одно длинное
+        событие расширяет поиск только в своей группе.
+        """
+        lo = to_minutes(start)
+        hi = to_minutes(end)
+        rows = []
+        bucket = self._conn.execute("SELECT MIN(bucket) FROM events").fetchone()[0]
+        while bucket is not None:
+            rows += self._conn.execute(
+                "SELECT start, id, title, type, date, duration_minutes, description, recurrence "
+                "FROM events WHERE bucket = ? AND start > ? AND start < ? "
+                "AND start + duration_minutes > ?", (bucket, lo - (1 << bucket), hi, lo)).fetchall()
+            bucket = self._conn.execute("SELECT MIN(bucket) FROM events WHERE bucket > ?",
+                                        (bucket,)).fetchone()[0]
+        rows.sort(key=lambda row: row[:2])
+        found = [self._event(row) for row in rows]
+        return self._with_series(found, start, end, overlap=True)
+    
+    def add_event(self, event: Event) -> None:
+        """Добавление нового события - одна строка"""
+        conflicts = self.find_overlapping(event.date, event.end)
+        self._conn.execute(
+            "INSERT INTO events (start, title, type, date, duration_minutes, description, recurrence, "
+            "bucket) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._row(event))
+        self._commit()
+        print("Событие добавлено!")
+        self._report_conflicts(conflicts)
+    
+    def add_events(self, events: Iterable[Event]) -> int:
+        """Массовое добавление событий одной транзакцией"""
+        with self.batch():
+            count = self._conn.executemany(
+                "INSERT INTO events (start, title, type, date, duration_minutes, description, "
+                "recurrence, bucket) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._row(event) for event in events)).rowcount
+        print(f"Добавлено {count} событий")
+        return count
+    
+    def edit_event(self, index: int, **kwargs) -> bool:
+        """Редактирование события по индексу - обновляется одна строка"""
+        row = self._row_at(index)
+        if row is None:
+            print("Неверный индекс события")
+            return False
         
-        upcoming = [
-            e for e in self.events 
-            if now <= e.date <= future_date
-        ]
+        event = self._event(row)
+        for name in EDITABLE_FIELDS:
+            if name in kwargs:
+                setattr(event, name, kwargs[name])
+        if 'duration_minutes' in kwargs:
+            event.duration_minutes = max(15, kwargs['duration_minutes'])
+        self._conn.execute(
+            "UPDATE events SET start = ?, title = ?, type = ?, date = ?, "
+            "duration_minutes = ?, description = ?, recurrence = ?, bucket = ? WHERE id = ?",
+            self._row(event) + (row[0],))
+        self._commit()
+        print("Событие отредактировано!")
+        return True
+    
+    def delete_event(self, index: int) -> bool:
+        """Удаление события по индексу - удаляется одна строка"""
+        row = self._row_at(index)
+        if row is None:
+            print("Неверный индекс события")
+            return False
         
-        return upcoming
+        self._conn.execute("DELETE FROM events WHERE id = ?", (row[0],))
+        self._commit()
+        print(f"Событие '{row[1]}' удалено!")
+        return True
+
+
+class _BaselineEvent:
+    """Событие в прежней раскладке (атрибуты в __dict__) - для сравнения памяти в benchmark_load"""
+    def __init__(self, data: Dict):
+        self.title = data["title"]
+        self.event_type = EventType(data["type"])
+        self.date = datetime.strptime(data["date"], DATE_FORMAT)
+        self.duration_minutes = max(15, data["duration_minutes"])
+        self.description = data.get("description", "")
+
+
+def _load_baseline(path: str) -> List[_BaselineEvent]:
+    """Загрузка файла событий так, как ее делал прежний Organizer: json.load целиком"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    events = [_BaselineEvent(event_data) for event_data in data["events"]]
+    events.sort(key=lambda x: x.date)
+    return events
+
+
+BENCH_SIZES = (10**3, 10**4, 10**5, 10**6)
+
+
+def _bench_write_events(path: str, n: int, rng: random.Random) -> None:
+    """Файл событий из n случайных событий в формате снимка"""
+    start = datetime(2024, 1, 1)
+    types = list(EventType)
+    # Порядок дат не важен: add_events сортирует пачку
+    events = [Event(f"Событие {i}", rng.choice(types),
+                    start + timedelta(minutes=15 * rng.randrange(100_000)),
+                    rng.randrange(15, 240), f"Описание {i}") for i in range(n)]
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        organizer = Organizer(path)
+        organizer.add_events(events)
+        organizer.save_events()
+
+
+def _bench_rate(n: int, run) -> float:
+    """Событий в секунду для run()"""
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    return n / seconds if seconds else float('inf')
+
+
+def benchmark_load(sizes=BENCH_SIZES, seed: int = 0) -> Iterator[Dict]:
+    """Замеры разбора дат, загрузки файла событий и памяти на событие
+    
+    parse - даты в секунду через strptime (прежний путь) и parse_date.
+    load - один и тот же файл снимка, загруженный в разных раскладках:
+    baseline (прежние Event с __dict__ через json.load), lazy (Organizer
+    с ленивыми полями) и hydrated (Organizer после обращения ко всем
+    полям); скорость в событиях в секунду и память в байтах на событие.
+    """
+    rng = random.Random(seed)
+    
+    def hydrated(path: str) -> Organizer:
+        organizer = Organizer(path)
+        for event in organizer.events:
+            event.title
+        return organizer
+    
+    layouts = (('baseline', _load_baseline), ('lazy', Organizer), ('hydrated', hydrated))
+    with tempfile.TemporaryDirectory() as directory:
+        for n in sizes:
+            texts = [format_date(datetime(2024, 1, 1) + timedelta(minutes=rng.randrange(10**6)))
+                     for _ in range(n)]
+            for parser, parse in (('strptime', lambda text: datetime.strptime(text, DATE_FORMAT)),
+                                  ('fast', parse_date)):
+                rate = _bench_rate(n, lambda: [parse(text) for text in texts])
+                yield {'bench': 'parse', 'parser': parser, 'n': n, 'events_per_sec': rate}
+            del texts
+            
+            path = os.path.join(directory, f"events_{n}.json")
+            _bench_write_events(path, n, rng)
+            for layout, load in layouts:
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    rate = _bench_rate(n, lambda: load(path))
+                    gc.collect()
+                    tracemalloc.start()
+                    try:
+                        loaded = load(path)
+                        current, _ = tracemalloc.get_traced_memory()
+                    finally:
+                        tracemalloc.stop()
+                    del loaded
+                yield {'bench': 'load', 'layout': layout, 'n': n,
+                       'events_per_sec': rate, 'bytes_per_event': current / n}
+
+
+def benchmark_main(argv: List[str]) -> None:
+    """python PythonHW.py bench [размеры через запятую] - записи JSON Lines в stdout"""
+    sizes = [int(size) for size in argv[0].split(',')] if argv else BENCH_SIZES
+    for record in benchmark_load(sizes):
+        print(json.dumps(record), flush=True)
 
 
 def print_menu():
@@ -204,6 +1350,26 @@ def get_event_type_from_user() -> EventType:
             print("Пожалуйста, введите число")
 
 
+def get_recurrence_from_user() -> Optional[Recurrence]:
+    """Выбор правила повторения пользователем"""
+    print("\nПовторение события:")
+    print("0. Не повторять")
+    for i, recurrence in enumerate(Recurrence, 1):
+        print(f"{i}. {recurrence.value}")
+    
+    while True:
+        try:
+            choice = int(input("Введите номер: "))
+            if choice == 0:
+                return None
+            if 1 <= choice <= len(Recurrence):
+                return list(Recurrence)[choice - 1]
+            else:
+                print("Неверный номер")
+        except ValueError:
+            print("Пожалуйста, введите число")
+
+
 def get_date_from_user(prompt: str) -> datetime:
     """Получение даты от пользователя"""
     while True:
@@ -227,8 +1393,9 @@ def get_duration_from_user() -> int:
             print("Пожалуйста, введите число")
 
 
-def main():
-    organizer = Organizer()
+def main(organizer: Optional[BaseOrganizer] = None):
+    if organizer is None:
+        organizer = Organizer()
     
     while True:
         print_menu()
@@ -258,8 +1425,9 @@ def main():
                 date = get_date_from_user("Дата и время начала")
                 duration = get_duration_from_user()
                 description = input("Описание (необязательно): ").strip()
+                recurrence = get_recurrence_from_user()
                 
-                event = Event(title, event_type, date, duration, description)
+                event = Event(title, event_type, date, duration, description, recurrence)
                 organizer.add_event(event)
             
             elif choice == 5:
@@ -278,6 +1446,7 @@ def main():
                     print("4. Продолжительность")
                     print("5. Описание")
                     print("6. Все поля")
+                    print("7. Повторение")
                     
                     edit_choice = int(input("Выберите: "))
                     
@@ -302,6 +1471,7 @@ def main():
                         new_date = get_date_from_user("Новая дата и время")
                         new_duration = get_duration_from_user()
                         new_description = input("Новое описание: ").strip()
+                        new_recurrence = get_recurrence_from_user()
                         
                         organizer.edit_event(
                             index,
@@ -309,8 +1479,12 @@ def main():
                             event_type=new_type,
                             date=new_date,
                             duration_minutes=new_duration,
-                            description=new_description
+                            description=new_description,
+                            recurrence=new_recurrence
                         )
+                    elif edit_choice == 7:
+                        new_recurrence = get_recurrence_from_user()
+                        organizer.edit_event(index, recurrence=new_recurrence)
                     else:
                         print("Неверный выбор")
                 
@@ -340,7 +1514,7 @@ def main():
             
             elif choice == 8:
                 print("Сохранение данных...")
-                organizer.save_events()
+                organizer.close()
                 print("До свидания!")
                 break
             
@@ -349,12 +1523,17 @@ def main():
         
         except ValueError:
             print("Пожалуйста, введите число")
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\n\nСохранение данных...")
-            organizer.save_events()
+            organizer.close()
             print("До свидания!")
             break
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        benchmark_main(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1].endswith('.db'):
+        main(SqliteOrganizer(sys.argv[1]))
+    else:
+        main()
\ No newline at end of file